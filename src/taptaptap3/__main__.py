@@ -1,11 +1,18 @@
 #!/usr/bin/env python3
 
 import sys
+import typing
 import taptaptap3
 
-if __name__ == "__main__":
-    doc = taptaptap3.parse_file(sys.argv[-1])
+
+def main(argv: typing.Sequence[str]) -> int:
+    """Print the TAP file given as last argument and return its validity"""
+    doc = taptaptap3.parse_file(argv[-1])
     print(str(doc), end=" ")
     if doc and doc.bailed():
-        sys.exit(-2)
-    sys.exit(0) if doc and doc.valid() else sys.exit(-1)
+        return -2
+    return 0 if doc and doc.valid() else -1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -40,6 +40,9 @@ def parse_string(string: str, lenient: bool=True) -> typing.Optional[TapDocument
     :param str string:          A string to parse
     :param bool lenient:        Lenient parsing? If so errors are thrown late.
     :return TapDocument doc:    TapDocument instance for this string
+
+    YAML blocks are loaded on first access or on validation,
+    malformed YAML raises ``yaml.YAMLError`` at that point.
     """
     tokenizer = TapDocumentTokenizer()
     tokenizer.from_string(string)
@@ -53,6 +56,9 @@ def parse_file(filepath: str, lenient: bool=True) -> typing.Optional[TapDocument
     :param str filepath:        A valid filepath for `open`
     :param bool lenient:        Lenient parsing? If so errors are thrown late.
     :return TapDocument doc:    TapDocument instance for this file
+
+    YAML blocks are loaded on first access or on validation,
+    malformed YAML raises ``yaml.YAMLError`` at that point.
     """
     tokenizer = TapDocumentTokenizer()
     tokenizer.from_file(filepath)
@@ -62,8 +68,20 @@ def parse_file(filepath: str, lenient: bool=True) -> typing.Optional[TapDocument
 
 def validate(doc: TapDocument) -> bool:
     """Does TapDocument `doc` represent a successful test run?"""
+    return _validate_with_stats(doc)[0]
+
+
+def _validate_with_stats(doc: TapDocument) -> typing.Tuple[bool, typing.Tuple[int, int, typing.Optional[int]]]:
+    """Like `validate`, but also return statistics gathered in the same pass.
+
+    :param TapDocument doc:     TapDocument instance to validate
+    :return tuple result:       ``(valid, (count_failed, count_total, first_failure))``
+                                where `first_failure` is the entry index of
+                                the first failed testcase or None
+    """
     validator = TapDocumentValidator(doc)
-    return validator.valid()
+    stats = (validator.count_failed, len(validator.numbers), validator.first_failure)
+    return validator.valid(), stats
 
 
 def harness(doc: TapDocument) -> str:
@@ -72,51 +90,49 @@ def harness(doc: TapDocument) -> str:
     Be aware that the example output shows a summary for a *set* of TAP files.
     We return the output for *one* TAP file and its testcases.
     """
-    out = ""
-    succeeded = []
+    out: typing.List[str] = []
     failed = []
     last_tc = None
     try:
         for tc in TapDocumentIterator(doc):
             if not tc.field:
                 failed.append(tc.number)
-                out += "{:.<23}not ok\n".format(tc.description)
+                out.append("{:.<23}not ok\n".format(tc.description))
             else:
-                succeeded.append(tc.number)
-                out += "{:.<23}ok\n".format(tc.description)
+                out.append("{:.<23}ok\n".format(tc.description))
             last_tc = tc.description
 
         if not failed:
-            out += "All tests successful.\n"
+            out.append("All tests successful.\n")
         else:
             cfailed = len(failed)
             ctotal = len(doc)
 
-            out += "FAILED tests {}\n".format(" ".join(map(str, failed)))
-            out += "\tFailed {}/{} tests, {:.2f}%% okay.".format(
+            out.append("FAILED tests {}\n".format(" ".join(map(str, failed))))
+            out.append("\tFailed {}/{} tests, {:.2f}%% okay.".format(
                 cfailed, ctotal, 100.0 * cfailed / ctotal
-            )
+            ))
 
     except TapBailout:
         cfailed = len(failed)
         ctotal = len(doc)
 
-        out += "DIED. FAILED tests {}".format(", ".join(map(str, failed)))
-        out += "        Failed {}/{} tests, {:2f}%% okay".format(
+        out.append("DIED. FAILED tests {}".format(", ".join(map(str, failed))))
+        out.append("        Failed {}/{} tests, {:2f}%% okay".format(
             cfailed, ctotal, 1.0 * cfailed / ctotal
-        )
+        ))
 
-        out += "Failed Test         Total Fail  Failed  List of Failed"
-        out += "-" * 61
-        out += "{: <20}{: >5}{: >5} {: >7} {}".format(
+        out.append("Failed Test         Total Fail  Failed  List of Failed")
+        out.append("-" * 61)
+        out.append("{: <20}{: >5}{: >5} {: >7} {}".format(
             last_tc,
             ctotal,
             cfailed,
             100.0 * cfailed / ctotal,
             " ".join(map(str, failed)),
-        )
+        ))
 
-    return out
+    return "".join(out)
 
 
 class TapWriter:
@@ -136,7 +152,7 @@ class TapWriter:
         """Define plan. Provide integers `first` and `last` XOR `tests`.
         `skip` is a non-empty message if the whole testsuite was skipped.
         """
-        if all([v is None for v in [first, last, tests]]):
+        if all(v is None for v in (first, last, tests)):
             raise ValueError("Provide either first and last params or tests")
         elif tests is not None:
             self._plan = (1, int(tests))
@@ -255,13 +271,13 @@ def TapCreator(func):
         try:
             count = 0
             for result in func(*args, **kwargs):
-                result["ok"]  # required param
-
                 data = result.get("data")
-                if "data" in result:
-                    del result["data"]
-
-                writer.testcase(**result)
+                writer.testcase(
+                    ok=result["ok"],  # required param
+                    description=result.get("description", ""),
+                    skip=result.get("skip", ""),
+                    todo=result.get("todo", ""),
+                )
                 if data:
                     for cmt in data:
                         writer.write(cmt)
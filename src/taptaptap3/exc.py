@@ -16,6 +16,9 @@ import typing
 
 __all__ = ["TapParseError", "TapMissingPlan", "TapInvalidNumbering", "TapBailout"]
 
+# line separator used for serialization
+NEWLINE = os.linesep
+
 
 class TapParseError(Exception):
     """Parsing of TAP file failed"""
@@ -48,11 +51,13 @@ class TapBailout(Exception):
         return getattr(self, 'message', self.args[0])
 
     def __str__(self) -> str:
+        if not self.data:
+            return "Bail out! {}{}".format(self.msg, NEWLINE)
         return "Bail out! {}{}{}".format(
-            self.msg, os.linesep, os.linesep.join(self.data)
+            self.msg, NEWLINE, NEWLINE.join(self.data)
         )
 
     def copy(self, memo: typing.Optional[str]=None) -> 'TapBailout':
         inst = TapBailout(memo or self.msg)
-        inst.data = self.data
+        inst.data = list(self.data)
         return inst
@@ -32,10 +32,9 @@ import re
 import os
 import sys
 import copy
-import yaml
-import codecs
 import logging
 import typing
+import functools
 import collections
 
 __all__ = [
@@ -55,12 +54,58 @@ __all__ = [
     "merge",
 ]
 
+# line separator used for serialization
+NEWLINE = os.linesep
+
 
 class YamlData:
     """YAML data storage"""
+    __slots__ = ("_data", "_source")
+
+    # strings which PyYAML emits as they are, in a list and at default width
+    PLAIN_SCALAR_REGEX: re.Pattern = re.compile(r"[A-Za-z][A-Za-z0-9_]*( [A-Za-z0-9_]+)*\Z")
+    # plain words which PyYAML would resolve to booleans or null
+    RESERVED_WORDS: typing.FrozenSet[str] = frozenset(
+        word
+        for base in ("yes", "no", "true", "false", "on", "off", "null")
+        for word in (base, base.capitalize(), base.upper())
+    )
 
     def __init__(self, data: dict):
-        self.data = data
+        self._data = data
+        self._source: typing.Optional[str] = None
+
+    @classmethod
+    def from_source(cls, source: str) -> 'YamlData':
+        """Create an instance for YAML `source`, which is loaded on first access"""
+        obj = cls.__new__(cls)
+        obj._data = None
+        obj._source = source
+        return obj
+
+    @property
+    def data(self) -> typing.Any:
+        """The loaded YAML data"""
+        if self._source is not None:
+            import yaml  # deferred, most TAP documents do not contain YAML data
+
+            self._data = yaml.safe_load(self._source)
+            self._source = None
+        return self._data
+
+    @data.setter
+    def data(self, value: typing.Any) -> None:
+        self._data = value
+        self._source = None
+
+    def __getstate__(self) -> typing.Tuple[typing.Any]:
+        """Return object state for external storage: (data,)"""
+        return (self.data,)
+
+    def __setstate__(self, state: typing.Tuple[typing.Any]) -> None:
+        """Import data using the provided state tuple"""
+        (self._data,) = state
+        self._source = None
 
     def __eq__(self, other) -> bool:
         if hasattr(other, 'data'):
@@ -71,20 +116,44 @@ class YamlData:
     def __iter__(self):
         return iter(self.data)
 
+    @classmethod
+    def _is_plain(cls, value: typing.Any) -> bool:
+        if type(value) is int:
+            return True
+        return (
+            type(value) is str
+            and len(value) <= 60
+            and cls.PLAIN_SCALAR_REGEX.match(value) is not None
+            and value not in cls.RESERVED_WORDS
+        )
+
     def __str__(self) -> str:
-        return yaml.safe_dump(self.data, explicit_start=True, explicit_end=True)
+        data = self.data
+        # fast path for flat lists of plain scalars, same output as PyYAML
+        if type(data) is list and data and all(map(self._is_plain, data)):
+            return "---\n" + "".join("- {}\n".format(item) for item in data) + "...\n"
+
+        import yaml  # deferred, most TAP documents do not contain YAML data
+
+        return yaml.safe_dump(data, explicit_start=True, explicit_end=True)
 
 
 class TapTestcase:
     """Object representation of an entry in a TAP file"""
+    __slots__ = ("_field", "_number", "_description", "_directives", "_data")
+
     is_testcase: bool = True
     is_bailout: bool = False
 
+    # regex for directive splitting
+    DIRECTIVE_SPLIT_REGEX: re.Pattern = re.compile(r"(skip|todo)", flags=re.I)
+    DIRECTIVE_KEYWORDS: typing.FrozenSet[str] = frozenset(("skip", "todo"))
+
     def __init__(self, field: typing.Optional[bool]=None, number: typing.Optional[int]=None, description: str=""):
         # test line
         self._field: typing.Optional[bool] = field
         self._number: typing.Optional[int] = number
-        self.description: str = description
+        self._description: str = description or ""
         self._directives: typing.MutableMapping[str, typing.List[str]] = {"skip": [], "todo": []}
         # data
         self._data: typing.List[str] = []
@@ -92,7 +161,8 @@ class TapTestcase:
     @staticmethod
     def indent(text: str, indent: int=2) -> str:
         """Indent all lines of ``text`` by ``indent`` spaces"""
-        return re.sub("(^|\n)(?!\n|$)", "\\1" + (" " * indent), text)
+        pad = " " * indent
+        return "\n".join(pad + line if line else line for line in text.split("\n"))
 
     @property
     def field(self) -> typing.Optional[bool]:
@@ -101,18 +171,20 @@ class TapTestcase:
 
     @field.setter
     def field(self, value: typing.Optional[typing.Union[bool, str]]) -> None:
-        errmsg = "field value must be 'ok' or 'not ok', not {!r}".format(value)
+        if value is None or value is True or value is False:
+            self._field = value
+            return
         try:
-            if value in [None, True, False]:
-                self._field = value
-            elif value.rstrip() == "ok":
-                self._field = True
-            elif value.rstrip() == "not ok":
-                self._field = False
-            else:
-                raise ValueError(errmsg)
+            stripped = value.rstrip()
         except AttributeError:
-            raise ValueError(errmsg)
+            stripped = None
+        if stripped == "ok":
+            self._field = True
+        elif stripped == "not ok":
+            self._field = False
+        else:
+            errmsg = "field value must be 'ok' or 'not ok', not {!r}"
+            raise ValueError(errmsg.format(value))
 
     @field.deleter
     def field(self):
@@ -140,15 +212,27 @@ class TapTestcase:
     def number(self) -> None:
         self._number = None
 
+    @property
+    def description(self) -> str:
+        """A TAP testcase description"""
+        return self._description
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self._description = value or ""
+
     @property
     def directive(self) -> str:
         """A TAP directive like 'TODO work in progress'"""
+        skips, todos = self._directives["skip"], self._directives["todo"]
+        if not skips and not todos:
+            return ""
         out = ""
-        for skip_msg in self._directives["skip"]:
-            out += "SKIP {} ".format(skip_msg.strip())
-        for todo_msg in self._directives["todo"]:
-            out += "TODO {} ".format(todo_msg.strip())
-        return out and out[:-1] or ""
+        for skip_msg in skips:
+            out += "SKIP " + skip_msg.strip() + " "
+        for todo_msg in todos:
+            out += "TODO " + todo_msg.strip() + " "
+        return out[:-1]
 
     @directive.setter
     def directive(self, value: str) -> None:
@@ -159,19 +243,21 @@ class TapTestcase:
         if not value:
             return
 
-        delimiters = ["skip", "todo"]
+        keywords = self.DIRECTIVE_KEYWORDS
         value = value.lstrip("#\t ")
-        fields = re.split("(" + "|".join(delimiters) + ")", value, flags=re.I)
+        fields = self.DIRECTIVE_SPLIT_REGEX.split(value)
         parts: typing.List[str] = list(filter(bool, fields))
 
-        if not parts or parts[0].lower() not in delimiters:
+        if not parts or parts[0].lower() not in keywords:
             raise ValueError("Directive must start with SKIP or TODO")
 
         key = None
         key_just_set = False
         for val in parts:
-            if val.lower() in delimiters:
-                key = val.lower()
+            lowered = val.lower()
+            if lowered in keywords:
+                # interned, so dict lookups hit the identity fast path
+                key = sys.intern(lowered)
                 if key_just_set:
                     self._directives[key] = []
                 key_just_set = True
@@ -193,9 +279,14 @@ class TapTestcase:
 
     @data.setter
     def data(self, value: typing.List[str]) -> None:
+        """Set annotated data. The list is copied, its elements are
+        stored by reference and must not be modified afterwards.
+        """
         assert hasattr(value, "__iter__"), "If you set data explicitly, it has to be a list"
 
-        self._data = copy.deepcopy(value)
+        # ``tc.data += [...]`` extends our own list in place
+        if value is not self._data:
+            self._data = list(value)
 
     @data.deleter
     def data(self) -> None:
@@ -230,11 +321,19 @@ class TapTestcase:
             self._directives["skip"].append(why)
 
     def copy(self) -> 'TapTestcase':
-        """Return a copy of myself"""
-        tc = TapTestcase()
-        tc.__setstate__(self.__getstate__())
+        """Return a copy of myself. Values are taken over as they are,
+        only the mutable containers are copied (one level deep).
+        """
+        tc = TapTestcase.__new__(TapTestcase)
+        tc._field = self._field
+        tc._number = self._number
+        tc._description = self._description
+        tc._directives = {key: list(msgs) for key, msgs in self._directives.items()}
+        tc._data = list(self._data)
         return tc
 
+    __copy__ = copy
+
     def __eq__(self, other: object) -> bool:
         """Test equality"""
         members = {'field', 'number', 'description', 'directive', 'data'}
@@ -259,23 +358,27 @@ class TapTestcase:
 
         return True
 
-    def __getstate__(self) -> typing.Dict[str, typing.Any]:
-        """Return object state for external storage"""
-        return {
-            "field": self.field,
-            "number": self.number,
-            "description": self.description or "",
-            "directives": self._directives,
-            "data": self.data,
-        }
+    def __getstate__(self) -> typing.Tuple[typing.Any, ...]:
+        """Return object state for external storage:
+        (field, number, description, directives, data)
+        """
+        return (
+            self._field,
+            self._number,
+            self._description or "",
+            self._directives,
+            self._data,
+        )
 
-    def __setstate__(self, obj: typing.Dict[str, typing.Any]) -> None:
-        """Import data using the provided object"""
-        self.field = obj["field"]
-        self.number = obj["number"]
-        self.description = obj["description"]
-        self._directives = obj["directives"]
-        self.data = obj["data"]
+    def __setstate__(self, state: typing.Tuple[typing.Any, ...]) -> None:
+        """Import data using the provided state tuple"""
+        (
+            self._field,
+            self._number,
+            self._description,
+            self._directives,
+            self._data,
+        ) = state
 
     def __repr__(self) -> str:
         """Representation of this object"""
@@ -294,28 +397,27 @@ class TapTestcase:
 
     def __str__(self) -> str:
         """TAP testcase representation as a string object"""
-        num, desc, directive = self.number, self.description, self.directive
+        num, desc, directive = self._number, self._description, self.directive
 
-        out = "ok " if self.field else "not ok "
+        out = "ok " if self._field else "not ok "
         if num is not None:
             out += str(num) + " "
         if desc:
             out += "- {} ".format(desc)
         if directive:
-            out += " # {} ".format(directive)
+            out += " # " + directive + " "
         out = out.rstrip()
-        if self.data:
-            data = [str(d) for d in self.data]
-            out += os.linesep + (os.linesep).join(data)
+        if self._data:
+            out = NEWLINE.join([out, *map(str, self._data)])
 
-        if out.endswith(os.linesep):
-            return out
-        else:
-            return out + os.linesep
+        if not out.endswith(NEWLINE):
+            out += NEWLINE
+        return out
 
 
 class TapNumbering:
     """TAP testcase numbering. In TAP documents it is called 'the plan'."""
+    __slots__ = ("first", "length")
 
     def __init__(self, first: typing.Optional[int]=None, last: typing.Optional[int]=None, tests: typing.Optional[int]=None, lenient: bool=True):
         """Constructor. Provide `first` and `last` XOR a number of `tests`.
@@ -360,11 +462,12 @@ class TapNumbering:
 
     def __contains__(self, tc_number: int) -> bool:
         """Is `tc_number` within this TapNumbering range?"""
-        return self.first <= tc_number and tc_number < self.first + self.length
+        first = self.first
+        return first <= tc_number < first + self.length
 
-    def enumeration(self) -> typing.List[int]:
+    def enumeration(self) -> range:
         """Get enumeration for the actual tap plan."""
-        return list(range(self.first, self.first + self.length))
+        return range(self.first, self.first + self.length)
 
     def inc(self) -> None:
         """Increase numbering for one new testcase"""
@@ -378,12 +481,11 @@ class TapNumbering:
         """Get range of this numbering: (min, max)"""
         return (self.first, self.first + self.length - 1)
 
-    def __getstate__(self) -> typing.Dict[str, typing.Any]:
-        return {"first": self.first, "length": self.length}
+    def __getstate__(self) -> typing.Tuple[int, int]:
+        return (self.first, self.length)
 
-    def __setstate__(self, state: typing.Dict[str, typing.Any]) -> None:
-        self.first = state["first"]
-        self.length = state["length"]
+    def __setstate__(self, state: typing.Tuple[int, int]) -> None:
+        self.first, self.length = state
 
     def __iter__(self):
         return iter(range(self.first, self.first + self.length))
@@ -398,9 +500,9 @@ class TapNumbering:
         return "<TapNumbering {}>".format((self.first, self.length))
 
 
-class TapActualNumbering(list):
-    """TAP testcase numbering. Wrapper for a sequence of testcase numbers."""
-    pass
+# TAP testcase numbering, a sequence of testcase numbers. A plain list
+# keeps the builtin fast paths which a subclass does not add anything to.
+TapActualNumbering = list
 
 
 class TapDocument:
@@ -422,6 +524,8 @@ class TapDocument:
             "skip": bool(skip),
             "skip_comment": "",
         }
+        # ((range, skip comment, skip), plan string)
+        self._plan_cache: typing.Optional[typing.Tuple[typing.Tuple[typing.Any, ...], str]] = None
 
     def __bool__(self) -> bool:
         return True
@@ -457,9 +561,9 @@ class TapDocument:
 
     def add_header_line(self, line: str) -> None:
         """Add header comment line for TAP document"""
-        if line.count(os.linesep) > 1:
+        if line.count(NEWLINE) > 1:
             raise ValueError("Header line must only be 1 (!) line")
-        line = str(line).rstrip() + os.linesep
+        line = str(line).rstrip() + NEWLINE
         self.metadata["header_comment"] += [line]
 
     def add_plan(self, first: int, last: int, skip_comment: str="", at_beginning: bool=True) -> None:
@@ -477,13 +581,20 @@ class TapDocument:
         """Add a ``TapBailout`` instance `bo` to this document"""
         self.entries.append(bo.copy())
 
+    def bulk_add(self, entries: typing.Iterable[typing.Union[TapTestcase, TapBailout]]) -> None:
+        """Add ``TapTestcase`` and ``TapBailout`` instances in one step.
+        In contrast to `add_testcase` and `add_bailout` the entries are
+        not copied, the document takes ownership of them.
+        """
+        self.entries.extend(entries)
+
     # processing
 
     @staticmethod
     def create_plan(first: int, last: int, comment: str="", skip: bool=False) -> str:
         plan = "{:d}..{:d}".format(first, last)
 
-        if os.linesep in comment:
+        if NEWLINE in comment:
             raise ValueError("Plan comment must not contain newline")
 
         if skip:
@@ -506,6 +617,22 @@ class TapDocument:
             return len(self.metadata["numbering"])
         return self.actual_length()
 
+    def _enumeration(self) -> typing.Tuple[typing.List[int], typing.Dict[int, int]]:
+        """Return the enumeration of testcases (see ``TapDocumentValidator``)
+        and a mapping of testcase numbers to their index in the enumeration.
+        """
+        enum = TapDocumentValidator(self).enumeration()
+        positions: typing.Dict[int, int] = {}
+        for index, nr in enumerate(enum):
+            positions.setdefault(nr, index)
+        return enum, positions
+
+    def _split_entries(self) -> typing.Tuple[typing.List[TapTestcase], typing.List[TapBailout]]:
+        """Return the testcase entries and the bailout entries as separate lists"""
+        testcases = [entry for entry in self.entries if entry.is_testcase]
+        bailouts = [entry for entry in self.entries if entry.is_bailout]
+        return testcases, bailouts
+
     def actual_length(self) -> int:
         """Return actual number of testcases in this document"""
         count = 0
@@ -526,17 +653,20 @@ class TapDocument:
         if not self.metadata["numbering"] or not self.entries:
             return (1, 0)
 
-        validator = TapDocumentValidator(self)
-        enum = validator.enumeration()
+        enum = self._enumeration()[0]
         return (min(enum), max(enum))
 
     def plan(self, comment: str="", skip: bool=False) -> str:
         """Get plan for this document"""
-        options = {
-            "comment": self.metadata["skip_comment"],
-            "skip": self.metadata["skip"],
-        }
-        return self.create_plan(*self.range(), **options)
+        # metadata is public, so the cache is keyed by its relevant values
+        key = (self.range(), self.metadata["skip_comment"], self.metadata["skip"])
+        cache = self._plan_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+
+        plan = self.create_plan(*key[0], comment=key[1], skip=key[2])
+        self._plan_cache = (key, plan)
+        return plan
 
     def actual_plan(self) -> str:
         """Get actual plan for this document"""
@@ -550,7 +680,7 @@ class TapDocument:
         """How many testcases which are 'not ok' are there?"""
         count = 0
         for entry in self.entries:
-            if entry.is_testcase and not entry.field:
+            if entry.is_testcase and not entry._field:
                 count += 1
         return count
 
@@ -558,7 +688,7 @@ class TapDocument:
         """How many testcases which are 'ok' are there?"""
         count = 0
         for entry in self.entries:
-            if entry.is_testcase and entry.field:
+            if entry.is_testcase and entry._field:
                 count += 1
         return count
 
@@ -566,7 +696,7 @@ class TapDocument:
         """How many testcases are still 'todo'?"""
         count = 0
         for entry in self.entries:
-            if entry.is_testcase and entry.todo:
+            if entry.is_testcase and entry._directives["todo"]:
                 count += 1
         return count
 
@@ -574,7 +704,7 @@ class TapDocument:
         """How many testcases got skipped in this document?"""
         count = 0
         for entry in self.entries:
-            if entry.is_testcase and entry.skip:
+            if entry.is_testcase and entry._directives["skip"]:
                 count += 1
         return count
 
@@ -602,14 +732,10 @@ class TapDocument:
         It exists iff a testcase object with this number or number 'None'
         exists as entry in doc which corresponds to this number.
         """
-        validator = TapDocumentValidator(self)
-        enum = validator.enumeration()
+        positions = self._enumeration()[1]
         try:
-            if self.entries[enum.index(int(num))] is None:
-                return False
-            else:
-                return True
-        except (ValueError, IndexError):
+            return int(num) in positions
+        except ValueError:
             return False
 
     def __getitem__(self, num: int) -> typing.Optional[typing.Union[TapTestcase, TapBailout]]:
@@ -626,11 +752,8 @@ class TapDocument:
         except ValueError:
             raise IndexError("Indexing requires testcase number")
 
-        validator = TapDocumentValidator(self)
-        enum = validator.enumeration()
-        try:
-            index = enum.index(num)
-        except ValueError:
+        index = self._enumeration()[1].get(num)
+        if index is None:
             doc_range = self.range()
             if doc_range[0] <= num <= doc_range[1]:
                 return None
@@ -638,16 +761,9 @@ class TapDocument:
             msg = "Testcase with number {} does not exist"
             raise IndexError(msg.format(num))
 
-        nr = 0
-        for entry in self.entries:
-            if entry.is_testcase:
-                if nr == index:
-                    e = copy.deepcopy(entry)
-                    e.number = num
-                    return e
-                nr += 1
-
-        return None
+        e = self._split_entries()[0][index].copy()
+        e.number = num
+        return e
 
     def __iter__(self):
         """Get iterator for testcases"""
@@ -656,7 +772,8 @@ class TapDocument:
     def __getstate__(self) -> typing.Dict[str, typing.Any]:
         """Return state of this object"""
         state = copy.copy(self.metadata)
-        state["entries"] = [entry.__getstate__() for entry in self.entries]
+        # entries take care of their own state (and bailouts have no custom one)
+        state["entries"] = [entry.copy() for entry in self.entries]
         if state["numbering"]:
             state["numbering"] = state["numbering"].__getstate__()
         return state
@@ -665,13 +782,11 @@ class TapDocument:
         """Restore object's state from `state`"""
         self.entries = []
         self.metadata = {}
+        self._plan_cache = None
 
         for key, value in state.items():
             if key == "entries":
-                for entry in value:
-                    tc = TapTestcase()
-                    tc.__setstate__(entry)
-                    self.entries.append(tc)
+                self.entries = list(value)
             elif key == "numbering":
                 if value is None:
                     self.metadata[key] = None
@@ -710,27 +825,26 @@ class TapDocument:
 
     def __str__(self) -> str:
         """String representation of TAP document"""
-        out = ""
+        out: typing.List[str] = []
         # version line
         if (
             self.metadata["version_written"]
             or self.metadata["version"] != self.DEFAULT_VERSION
         ):
-            out += "TAP version {:d}".format(self.metadata["version"])
-            out += os.linesep
+            out.append("TAP version {:d}".format(self.metadata["version"]))
+            out.append(NEWLINE)
         # header comments
-        for comment in self.metadata["header_comment"]:
-            out += str(comment)
+        out.extend(str(comment) for comment in self.metadata["header_comment"])
         # [possibly] plan
         if self.metadata["plan_at_beginning"]:
-            out += self.plan() + os.linesep
+            out.append(self.plan() + NEWLINE)
         # testcases and bailouts
-        for entry in self.entries:
-            out += str(entry)
+        out.extend(str(entry) for entry in self.entries)
         # [possibly] plan
-        out += self.plan() if not self.metadata["plan_at_beginning"] else ""
+        if not self.metadata["plan_at_beginning"]:
+            out.append(self.plan())
 
-        return out
+        return "".join(out)
 
 
 class TapDocumentValidator:
@@ -744,19 +858,32 @@ class TapDocumentValidator:
         """
         self.lenient: bool = lenient
         self.skip: bool = doc.skip
-        self.bailed: bool = doc.bailed()
 
         if not doc.metadata["numbering"]:
             raise TapMissingPlan("Plan required before document validation")
 
-        # retrieve numbers and range
+        # retrieve numbers, failures and bailouts in one pass
         self.numbers: typing.List[typing.Optional[int]] = []
         self.validity: bool = True
-        for entry in doc.entries:
+        self.bailed: bool = False
+        self.count_failed: int = 0
+        self.first_failure: typing.Optional[int] = None
+        # YAML blocks are loaded on first access, `load_yaml` loads them all
+        data = list(doc.metadata["header_comment"])
+        for index, entry in enumerate(doc.entries):
             if entry.is_testcase:
                 self.numbers.append(entry.number)
                 if not entry.field and not entry.skip:
+                    if self.validity:
+                        self.first_failure = index
                     self.validity = False
+                    self.count_failed += 1
+                if entry._data:
+                    data += entry._data
+            elif entry.is_bailout:
+                self.bailed = True
+                data += entry.data
+        self.yaml_blocks: typing.List[YamlData] = [d for d in data if type(d) is YamlData]
         self.range: typing.Tuple[int, int] = doc.range()
 
         # prepare enumeration
@@ -770,9 +897,11 @@ class TapDocumentValidator:
             msg = "More testcases provided than allowed by plan"
             raise TapInvalidNumbering(msg)
 
-        # Is some given number outside of range?
-        for nr in self.numbers:
-            if nr is not None:
+        # Is some given number outside of range? min/max tell in C,
+        # the loop only runs to find the offending number for the message
+        given = [nr for nr in self.numbers if nr is not None]
+        if given and (min(given) < self.range[0] or max(given) > self.range[1]):
+            for nr in given:
                 if not (self.range[0] <= nr <= self.range[1]):
                     msg = "Testcase number {} is outside of plan {}..{}"
                     raise TapInvalidNumbering(msg.format(nr, *self.range))
@@ -807,58 +936,47 @@ class TapDocumentValidator:
           But if a high integer is given, this one is used instead.
         * Returns a sequence of positive numbers or raises a ValueError.
         """
-        assigned: typing.Set[int] = set()
-        fixed: typing.Set[int] = set()
+        # used numbers mapped to their index in `sequence` if they were
+        # assigned automatically, or to None if they were given explicitly
+        used: typing.Dict[int, typing.Optional[int]] = {}
         sequence: typing.List[int] = []
-        next_number: int = 1
+        # used numbers never get released, so no number below is free
+        candidate: int = first
 
         reuse_errmsg = "Testcase number {} was already used"
 
-        def get_next_number(nr: int) -> int:
-            nr = first
-            while nr in assigned or nr in fixed:
-                nr += 1
-            return nr
+        def get_next_number() -> int:
+            nonlocal candidate
+            while candidate in used:
+                candidate += 1
+            return candidate
 
         for nr in numbers:
             if nr is None:
-                next_number = get_next_number(next_number)
-
-                assigned.add(next_number)
+                next_number = get_next_number()
+                used[next_number] = len(sequence)
                 sequence.append(next_number)
-                next_number += 1
+            elif nr not in used:
+                used[nr] = None
+                sequence.append(nr)
             else:
-                if nr in fixed:
+                index = used[nr]
+                if index is None or not lenient:
                     raise ValueError(reuse_errmsg.format(nr))
-                elif nr in assigned:
-                    if not lenient:
-                        raise ValueError(reuse_errmsg.format(nr))
-                    next_number = get_next_number(next_number)
-
-                    # replace "nr" with "next_number" in assigned and sequence
-                    assigned.remove(nr)
-                    fixed.add(next_number)
-                    sequence = [(next_number if e == nr else e) for e in sequence]
-                    sequence.append(nr)
-
-                    next_number += 1
-                else:
-                    fixed.add(nr)
-                    sequence.append(nr)
-                    if nr > next_number:
-                        next_number = nr + 1
+
+                # move the testcase which got "nr" assigned to "next_number"
+                used[nr] = None
+                next_number = get_next_number()
+                used[next_number] = None
+                sequence[index] = next_number
+                sequence.append(nr)
 
         return sequence
 
     def all_exist(self) -> bool:
         """Do all testcases in specified `range` exist?"""
         self.enumeration()
-        try:
-            for i in range(self.range[0], self.range[1] + 1):
-                self.enum.index(i)
-            return True
-        except ValueError:
-            return False
+        return set(self.enum).issuperset(range(self.range[0], self.range[1] + 1))
 
     def __bool__(self) -> bool:
         return self.valid()
@@ -891,12 +1009,22 @@ class TapDocumentValidator:
 
         :param bool lenient:    Shall I ignore more complex errors?
         """
+        self.load_yaml()
         self.test_range_validity()
         self.enumerate(self.numbers, self.range[0], lenient)
 
+    def load_yaml(self) -> None:
+        """Load all pending YAML blocks of the document.
+        Raises ``yaml.YAMLError`` if some block is malformed.
+        """
+        for block in self.yaml_blocks:
+            block.data
+
     def valid(self, lenient: bool=True) -> bool:
         """Is the given document valid, meaning that `numbers` and `range` match?
+        Malformed YAML blocks raise ``yaml.YAMLError``.
         """
+        self.load_yaml()
         if self.bailed:
             return False
         elif self.skip:
@@ -919,35 +1047,43 @@ class TapDocumentIterator:
 
     def __init__(self, doc: TapDocument, raise_bailout: bool=True):
         self.skip: bool = doc.skip
-        self.entries: typing.List[typing.Union[TapTestcase, TapBailout]] = copy.deepcopy(doc.entries)
-        self.enum: typing.Optional[typing.List[int]] = TapDocumentValidator(doc).enumeration()
+        # entries are shared with `doc`, only returned ones get copied
+        self.entries: typing.List[typing.Union[TapTestcase, TapBailout]] = doc.entries
+        self.enum, self.positions = doc._enumeration()
         self.current, self.end = doc.range()
         self.raise_bailout: bool = raise_bailout
 
+        # indices of testcase entries and of the first bailout in `entries`
+        self.testcases: typing.List[int] = []
+        self.first_bailout: typing.Optional[int] = None
+        for index, entry in enumerate(self.entries):
+            if entry.is_testcase:
+                self.testcases.append(index)
+            elif self.first_bailout is None:
+                self.first_bailout = index
+
     def __iter__(self):
         return self
 
     def lookup(self, num: int) -> typing.Optional[TapTestcase]:
         """Return testcase for given number or None"""
-        try:
-            entries_index = self.enum.index(num)
-        except ValueError:
-            if self.raise_bailout:
-                entries_index = -1
-            else:
+        tc_index = self.positions.get(num)
+        if tc_index is None:
+            if not self.raise_bailout:
                 return None
+            position = len(self.entries)
+        else:
+            position = self.testcases[tc_index]
 
-        i = 0
-        for entry in self.entries:
-            if entry.is_testcase:
-                if entries_index == i:
-                    entry.number = num
-                    return entry
-                i += 1
-            elif self.raise_bailout:
-                raise entry
+        if self.raise_bailout and self.first_bailout is not None:
+            if self.first_bailout < position:
+                raise self.entries[self.first_bailout].copy()
 
-        return None
+        if tc_index is None:
+            return None
+        entry = self.entries[position].copy()
+        entry.number = num
+        return entry
 
     def __next__(self) -> typing.Optional[TapTestcase]:
         if self.skip:
@@ -964,7 +1100,8 @@ class TapDocumentActualIterator:
 
     def __init__(self, doc: TapDocument, raise_bailout: bool=True):
         self.skip: bool = doc.skip
-        self.entries: typing.List[typing.Union[TapTestcase, TapBailout]] = copy.deepcopy(doc.entries)
+        # entries are shared with `doc`, only returned ones get copied
+        self.entries: typing.List[typing.Union[TapTestcase, TapBailout]] = doc.entries
         self.current: int = 0
         self.raise_bailout: bool = raise_bailout
 
@@ -980,9 +1117,9 @@ class TapDocumentActualIterator:
             entry = self.entries[self.current]
             self.current += 1
             if entry.is_testcase:
-                return entry
+                return entry.copy()
             elif self.raise_bailout:
-                raise entry
+                raise entry.copy()
         return None
             
 
@@ -1009,7 +1146,7 @@ class TapDocumentFailedIterator:
                 entry = self.doc.entries[self.current]
                 self.current += 1
                 if entry.is_testcase and not entry.field:
-                    return copy.deepcopy(entry)
+                    return entry.copy()
 
 
 class TapDocumentTokenizer:
@@ -1032,102 +1169,174 @@ class TapDocumentTokenizer:
     PLAN_REGEX: re.Pattern = re.compile(
         r"(?P<first>\d+)\.\.(?P<last>\d+)\s*" r"(?P<comment>#.*?)?$"
     )
+    # the remainder after field and number is split by DIRECTIVE_REGEX;
+    # nesting lazy groups in one regex backtracks quadratically on whitespace
     TESTCASE_REGEX: re.Pattern = re.compile(
-        (
-            r"(?P<field>(not )?ok)"
-            r"(\s+(?P<number>\d+))?"
-            r"(\s+(?P<description>[^\n]*?)"
-            r"(\s+#(?P<directive>(\s+(TODO|SKIP).*?)+?))?)?\s*$"
-        ),
+        r"(?P<field>(not )?ok)(\s+(?P<number>\d+)(?!\S))?(?P<rest>\s.*)?$",
         flags=re.IGNORECASE,
     )
+    DIRECTIVE_REGEX: re.Pattern = re.compile(r"\s#(?=\s+(TODO|SKIP))", flags=re.IGNORECASE)
     BAILOUT_REGEX: re.Pattern = re.compile(
         r"Bail out!(?P<comment>.*)", flags=re.MULTILINE | re.IGNORECASE
     )
 
-    # lookalike matches
-    VERSION_LOOKALIKE: str = "tap version"
-    PLAN_LOOKALIKE: str = "1.."
-    TESTCASE_LOOKALIKE: typing.List[str] = ["not ok ", "ok "]
+    # first character of a line (lowercased) to the token it can represent,
+    # lines starting with a digit can only be plans
+    LINE_KINDS: typing.Dict[str, str] = {
+        "t": "VERSION_LINE",
+        "o": "TESTCASE",
+        "n": "TESTCASE",
+        "b": "BAILOUT",
+    }
+
+    # a line terminated by one of the line boundaries of str.splitlines
+    LINE_REGEX: re.Pattern = re.compile(
+        r"([^\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]*)"
+        r"(?:\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029])"
+    )
+
+    # lookalike matches, tested against lines which did not match above
+    LOOKALIKE_REGEX: re.Pattern = re.compile(
+        r"\s*(?:(?P<WARN_VERSION_LINE>tap version)|(?P<WARN_PLAN>1\.\.)"
+        r"|(?P<WARN_TESTCASE>(not )?ok (?=\s*\S)))",
+        flags=re.IGNORECASE,
+    )
+    LOOKALIKE_NAMES: typing.Dict[str, str] = {
+        "WARN_VERSION_LINE": "version line",
+        "WARN_PLAN": "plan",
+        "WARN_TESTCASE": "test line",
+    }
 
     def __init__(self):
-        self.pipeline: typing.Deque[typing.Any] = collections.deque()
+        # sequences of lines not tokenized yet
+        self.sources: typing.Deque[typing.Iterable[str]] = collections.deque()
         self.last_indentation: typing.Optional[int] = 0
 
     @classmethod
     def strip_comment(cls, cmt: typing.Optional[str]) -> str:
         if cmt is None:
             return ""
-        return cmt.lstrip().lstrip("#-").lstrip().rstrip()
-
-    def parse_line(self, line: str) -> None:
-        """Parse one line of a TAP file"""
-        match1 = self.VERSION_REGEX.match(line)
-        match2 = self.PLAN_REGEX.match(line)
-        match3 = self.TESTCASE_REGEX.match(line)
-        match4 = self.BAILOUT_REGEX.match(line)
-
-        add = lambda *x: self.pipeline.append(x)
-
-        if match1:
-            add("VERSION_LINE", int(match1.group("version")))
-            self.last_indentation = None
-        elif match2:
-            add(
-                "PLAN",
-                (int(match2.group("first")), int(match2.group("last"))),
-                self.strip_comment(match2.group("comment")),
-            )
-            self.last_indentation = None
-        elif match3:
-            number = match3.group("number")
-            number = int(number) if number else None
-            add(
-                "TESTCASE",
-                match3.group("field").lower() == "ok",
-                number,
-                self.strip_comment(match3.group("description")),
-                match3.group("directive"),
-            )
-            self.last_indentation = 0
-        elif match4:
-            add("BAILOUT", match4.group("comment").strip())
-            self.last_indentation = None
+        return cmt.lstrip().lstrip("#-").strip()
+
+    @staticmethod
+    def _match_plain_testcase(line: str) -> typing.Optional[typing.Tuple[bool, int, str, None]]:
+        """Match the common test line "ok 1 - description" without directive
+        like `_match_testcase`, but without regex and cache. None otherwise.
+        """
+        if line.startswith("ok "):
+            number, _, rest = line[3:].partition(" ")
+        elif line.startswith("not ok "):
+            number, _, rest = line[7:].partition(" ")
         else:
-            sline = line.lower().strip()
-            lookalike = 'Line "{}" looks like a {}, but does not match syntax'
+            return None
+        if number.isdecimal() and "#" not in rest and "\n" not in rest:
+            description = TapDocumentTokenizer.strip_comment(rest)
+            return (line[0] == "o", int(number), sys.intern(description), None)
+        return None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _match_testcase(line: str) -> typing.Optional[typing.Tuple[bool, typing.Optional[int], str, typing.Optional[str]]]:
+        """Match `line` as test line and return (field, number, description, directive).
+        Results are cached, because TAP output tends to repeat identical lines.
+        """
+        match = TapDocumentTokenizer.TESTCASE_REGEX.match(line)
+        if not match:
+            return None
+        number = match.group("number")
+        rest = match.group("rest") or ""
+
+        # the directive must follow a non-empty description
+        directive = None
+        rest = rest.lstrip()
+        split = TapDocumentTokenizer.DIRECTIVE_REGEX.search(rest)
+        if split:
+            directive = rest[split.end() :].rstrip()
+            rest = rest[: split.start()]
+        description = TapDocumentTokenizer.strip_comment(rest)
+
+        return (
+            match.group("field").lower() == "ok",
+            int(number) if number else None,
+            sys.intern(description),
+            directive,
+        )
 
-            if sline.startswith(self.VERSION_LOOKALIKE):
-                add("WARN_VERSION_LINE", lookalike.format(sline, "version line"))
-            elif sline.startswith(self.PLAN_LOOKALIKE):
-                add("WARN_PLAN", lookalike.format(sline, "plan"))
-            elif sline.startswith(self.TESTCASE_LOOKALIKE[0]):
-                add("WARN_TESTCASE", lookalike.format(sline, "test line"))
-            elif sline.startswith(self.TESTCASE_LOOKALIKE[1]):
-                add("WARN_TESTCASE", lookalike.format(sline, "test line"))
+    def parse_line(self, line: str) -> typing.Tuple[typing.Tuple[typing.Any, ...], ...]:
+        """Parse one line of a TAP file and return its tokens"""
+        # the first character determines the only regex which can match
+        first = line[:1].lower()
+        kind = self.LINE_KINDS.get(first) or ("PLAN" if first.isdecimal() else None)
+        if kind is None and not first.isspace():
+            # neither TAP syntax nor a lookalike, these might be indented only
+            return (("DATA", line),)
+
+        if kind == "VERSION_LINE":
+            match = self.VERSION_REGEX.match(line)
+            if match:
+                self.last_indentation = None
+                return (("VERSION_LINE", int(match.group("version"))),)
+        elif kind == "PLAN":
+            match = self.PLAN_REGEX.match(line)
+            if match:
+                self.last_indentation = None
+                plan = (int(match.group("first")), int(match.group("last")))
+                return (("PLAN", plan, self.strip_comment(match.group("comment"))),)
+        elif kind == "TESTCASE":
+            # numbered plain test lines are usually unique, skip the cache
+            testcase = self._match_plain_testcase(line) or self._match_testcase(line)
+            if testcase:
+                self.last_indentation = 0
+                return (("TESTCASE", *testcase),)
+        elif kind == "BAILOUT":
+            match = self.BAILOUT_REGEX.match(line)
+            if match:
+                self.last_indentation = None
+                return (("BAILOUT", match.group("comment").strip()),)
+
+        lookalike = self.LOOKALIKE_REGEX.match(line)
+        if lookalike:
+            token = lookalike.lastgroup
+            msg = 'Line "{}" looks like a {}, but does not match syntax'
+            msg = msg.format(line.lower().strip(), self.LOOKALIKE_NAMES[token])
+            return ((token, msg), ("DATA", line))
+
+        return (("DATA", line),)
 
-            add("DATA", line)
+    @classmethod
+    def _read_file(cls, filepath: str, encoding: str) -> typing.Iterator[str]:
+        # a single read is much faster than iterating a codecs stream;
+        # lines are split at the same boundaries (those of str.splitlines)
+        with open(filepath, encoding=encoding, newline="") as fp:
+            content = fp.read()
+        yield from cls._split_lines(content)
 
     def from_file(self, filepath: str, encoding: str="utf-8") -> None:
-        """Read TAP file using `filepath` as source."""
-        with codecs.open(filepath, encoding=encoding) as fp:
-            for line in fp.readlines():
-                self.parse_line(line.rstrip("\n\r"))
+        """Read TAP file using `filepath` as source.
+        The file is read lazily while tokens are consumed.
+        """
+        self.sources.append(self._read_file(filepath, encoding))
+
+    @classmethod
+    def _split_lines(cls, string: str) -> typing.Iterator[str]:
+        """Like ``str.splitlines``, but generate the lines one by one"""
+        end = 0
+        for match in cls.LINE_REGEX.finditer(string):
+            yield match.group(1)
+            end = match.end()
+        if end < len(string):
+            yield string[end:]
 
     def from_string(self, string: str) -> None:
         """Read TAP source code from the given `string`."""
-        for line in string.splitlines():
-            self.parse_line(line.rstrip("\n\r"))
+        self.sources.append(self._split_lines(string))
 
-    def __iter__(self):
-        return self
-
-    def __next__(self):
-        try:
-            while True:
-                return self.pipeline.popleft()
-        except IndexError:
-            raise StopIteration("All tokens consumed.")
+    def __iter__(self) -> typing.Iterator[typing.Tuple[typing.Any, ...]]:
+        """Generate the tokens of all sources in the order they were added"""
+        parse_line = self.parse_line
+        while self.sources:
+            for line in self.sources.popleft():
+                yield from parse_line(line.rstrip("\n\r"))
 
 
 class TapDocumentParser:
@@ -1148,25 +1357,32 @@ class TapDocumentParser:
     def parse_data(cls, lines: typing.List[str]) -> typing.List[typing.Any]:
         """Give me some lines and I will parse it as data"""
         data: typing.List[typing.Any] = []
-        yaml_mode = False
-        yaml_cache = ""
+        # lines of the current text block and of the current YAML block,
+        # joined once the block is complete
+        text: typing.List[str] = []
+        yaml_lines: typing.Optional[typing.List[str]] = None
+
+        newline = NEWLINE
+        add_text = text.append
 
         for line in lines:
-            if line.strip() == "---":
-                yaml_mode = True
-            elif yaml_mode and line.strip() == "...":
-                data.append(YamlData(yaml.safe_load(yaml_cache)))
-                yaml_cache = ""
-                yaml_mode = False
-            else:
-                if yaml_mode:
-                    yaml_cache += line + os.linesep
+            stripped = line.strip()
+            if yaml_lines is None:
+                if stripped == "---":
+                    yaml_lines = []
                 else:
-                    line = line.rstrip("\r\n")
-                    if len(data) > 0 and isinstance(data[-1], str):
-                        data[-1] += line + os.linesep
-                    else:
-                        data.append(line + os.linesep)
+                    add_text(line.rstrip("\r\n"))
+            elif stripped == "...":
+                if text:
+                    data.append(newline.join(text) + newline)
+                    text.clear()
+                data.append(YamlData.from_source(newline.join(yaml_lines) + newline))
+                yaml_lines = None
+            elif stripped != "---":
+                yaml_lines.append(line)
+
+        if text:
+            data.append(NEWLINE.join(text) + NEWLINE)
         return data
 
     def warn(self, msg: str) -> None:
@@ -1178,65 +1394,72 @@ class TapDocumentParser:
 
     def parse(self) -> None:
         """Parse the tokens provided by `self.tokenizer`."""
-        self.doc = TapDocument()
+        doc = self.doc = TapDocument()
         state = 0
         plan_written = False
         comment_cache: typing.List[str] = []
+        # entries are collected here and added to the document at the end
+        entries: typing.List[typing.Union[TapTestcase, TapBailout]] = []
 
-        def flush_cache(comment_cache: typing.List[str]) -> typing.List[str]:
+        # bound once, the loop below runs for every token
+        parse_data = self.parse_data
+        add_comment = comment_cache.append
+        add_entry = entries.append
+
+        def flush_cache() -> None:
             if comment_cache:
-                if self.doc.entries:
-                    self.doc.entries[-1].data += self.parse_data(comment_cache)
+                if entries:
+                    entries[-1].data += parse_data(comment_cache)
                 else:
-                    for line in self.parse_data(comment_cache):
-                        self.doc.metadata["header_comment"] += [line]
-                comment_cache = []
-            return comment_cache
+                    doc.metadata["header_comment"] += parse_data(comment_cache)
+                comment_cache.clear()
 
+        # branches are ordered by frequency of the token in TAP files
         for tok in self.tokenizer:
-            if tok[0] == "VERSION_LINE":
-                if state != 0:
-                    msg = "Unexpected version line. " "Must only occur as first line."
-                    raise TapParseError(msg)
-                self.doc.add_version_line(tok[1])
-                state = 1
-            elif tok[0] == "PLAN":
-                comment_cache = flush_cache(comment_cache)
+            kind = tok[0]
+            if kind == "TESTCASE":
+                flush_cache()
+
+                # field and number are already validated by the tokenizer
+                tc = TapTestcase(tok[1], tok[2] or None, tok[3] or None)
+                if tok[4]:
+                    tc.directive = tok[4]
+
+                add_entry(tc)
+                state = 2
+            elif kind == "DATA":
+                add_comment(tok[1])
+                state = 2
+            elif kind == "BAILOUT":
+                flush_cache()
+
+                add_entry(TapBailout(tok[1]))
+                state = 2
+            elif kind == "PLAN":
+                flush_cache()
                 if plan_written:
                     msg = "Plan must not occur twice in one document."
                     raise TapParseError(msg)
                 if tok[1][0] > tok[1][1] and not (tok[1] == (1, 0)):
                     self.warn("Plan defines a decreasing range.")
 
-                self.doc.add_plan(tok[1][0], tok[1][1], tok[2], state <= 1)
+                doc.add_plan(tok[1][0], tok[1][1], tok[2], state <= 1)
                 state = 2
                 plan_written = True
-            elif tok[0] == "TESTCASE":
-                comment_cache = flush_cache(comment_cache)
-
-                tc = TapTestcase()
-                tc.field = tok[1]
-                tc.number = tok[2] if tok[2] else None
-                tc.description = tok[3] if tok[3] else None
-                tc.directive = tok[4] if tok[4] else None
-
-                self.doc.add_testcase(tc)
-                state = 2
-            elif tok[0] == "BAILOUT":
-                comment_cache = flush_cache(comment_cache)
-
-                self.doc.add_bailout(TapBailout(tok[1]))
-                state = 2
-            elif tok[0] == "DATA":
-                comment_cache.append(tok[1])
-                state = 2
-            elif tok[0] in ["WARN_VERSION_LINE", "WARN_PLAN", "WARN_TESTCASE"]:
+            elif kind == "VERSION_LINE":
+                if state != 0:
+                    msg = "Unexpected version line. " "Must only occur as first line."
+                    raise TapParseError(msg)
+                doc.add_version_line(tok[1])
+                state = 1
+            elif kind in ("WARN_VERSION_LINE", "WARN_PLAN", "WARN_TESTCASE"):
                 self.warn(tok[1])
                 state = 2
             else:
                 raise ValueError("Unknown token: {}".format(tok))
 
-        comment_cache = flush_cache(comment_cache)
+        flush_cache()
+        doc.bulk_add(entries)
         return None
 
     @property
@@ -1248,6 +1471,7 @@ class TapDocumentParser:
 
 class TapProtocol:
     """The interface/protocol of a TAP implementation"""
+    __slots__ = ()
 
     def __init__(self, version: int=TapDocument.DEFAULT_VERSION):
         return NotImplemented
@@ -1276,6 +1500,7 @@ class TapWrapper(TapProtocol):
     thus allowing method chaining. `plan` can be called at any time
     unlike the TAP file format specification defines.
     """
+    __slots__ = ("doc", "_plan")
 
     def __init__(self, doc: typing.Optional[TapDocument]=None, version: int=TapDocument.DEFAULT_VERSION):
         """Take a `doc` (or create a new one)"""
@@ -1291,7 +1516,7 @@ class TapWrapper(TapProtocol):
             raise RuntimeError("Only one plan per document allowed")
 
         err_msg = "Provide either first and last params or tests param"
-        if all([v is None for v in [first, last, tests]]):
+        if all(v is None for v in (first, last, tests)):
             raise ValueError(err_msg)
         else:
             if tests is not None:
@@ -1323,7 +1548,8 @@ class TapWrapper(TapProtocol):
         if todo:
             tc.todo = todo
 
-        self.doc.add_testcase(tc)
+        # `tc` is never handed out, so the copy of `add_testcase` is not needed
+        self.doc.entries.append(tc)
         return self
 
     def ok(self, description: str="", skip: bool=False, todo: bool=False) -> 'TapWrapper':
@@ -1377,68 +1603,63 @@ def merge(*docs: TapDocument) -> typing.Optional[TapDocument]:
         return None
 
     doc = TapDocument()
-    doc.set_version(max([d.metadata["version"] for d in docs]))
-
-    for d in docs:
-        if d.metadata["header_comment"]:
-            comments = [c for c in d.metadata["header_comment"] if c.strip()]
-            doc.metadata["header_comment"] += comments
-
-    # normalize ranges
-    ranges, offset = [], 1
-    minimum: float = float("inf")
-    maximum: float = 0.
+    version = docs[0].metadata["version"]
+    header_comments = doc.metadata["header_comment"]
+    skip_comments: typing.List[str] = []
+    plan_at_beginning = False
+
+    # metadata, ranges and entries are processed in one pass over `docs`
+    offset = 1
+    minimum: typing.Optional[int] = None
+    maximum: int = 0
     count: int = 0
     for d in docs:
-        r = list(d.range())
-        r[1] = max(r[1], r[0] + len(d) - 1)
-        r = [x + offset - r[0] for x in r]
-        offset = r[1] + 1
-        ranges.append(tuple(r))
-
-    for d_id, d in enumerate(docs):
-        # create copies and assign normalized numbers
-        numbers, count_assignments = [], 0
+        metadata = d.metadata
+        version = max(version, metadata["version"])
+        if metadata["header_comment"]:
+            header_comments += [c for c in metadata["header_comment"] if c.strip()]
+        if metadata["skip"] and metadata["skip_comment"]:
+            skip_comments.append(metadata["skip_comment"])
+        plan_at_beginning = plan_at_beginning or metadata["plan_at_beginning"]
+
+        # normalize range
+        first, last = d.range()
+        last = max(last, first + len(d) - 1)
+        start = offset
+        offset = last + offset - first + 1
+
+        # normalized numbers of the testcases; None is assigned by `enumerate`
+        numbers: typing.List[typing.Optional[int]] = []
         for entry in d.entries:
-            c = entry.copy()
             if entry.is_testcase:
-                if c.number is not None:
-                    c.number -= d.range()[0]
-                    c.number += ranges[d_id][0]
-                numbers.append(c.number)
+                number = entry.number
+                if number is not None:
+                    if number < first:
+                        raise ValueError("Testcase number must not be negative")
+                    number += start - first
+                numbers.append(number)
+        enums = iter(TapDocumentValidator.enumerate(numbers, first=start))
+
+        # copies share description and data items with the source document
+        for entry in d.entries:
+            c = entry.copy()
+            if c.is_testcase:
+                number = next(enums)
+                c.number = number
+                if minimum is None or number < minimum:
+                    minimum = number
+                if number > maximum:
+                    maximum = number
             doc.entries.append(c)
-            count_assignments += 1
-
-        # use `enumerate` to compute assignments
-        enums = TapDocumentValidator.enumerate(numbers, first=ranges[d_id][0])
-        if enums:
-            minimum = min(minimum, min(enums))
-            maximum = max(maximum, max(enums))
-        # assign numbers
-        index = 0
-        for entry in doc.entries[-count_assignments or len(doc.entries) :]:
-            if not entry.is_testcase:
-                continue
-            number = enums[index]
-            entry.number = number
-            minimum, maximum = min(minimum, number), max(maximum, number)
-            index += 1
-            count += 1
-
-    skip_comments = []
-    for d in docs:
-        if d.metadata["skip"] and d.metadata["skip_comment"]:
-            skip_comments.append(d.metadata["skip_comment"])
+        count += len(numbers)
 
-    pab = any([d.metadata["plan_at_beginning"] for d in docs])
+    doc.set_version(version)
 
-    if count == 0:
+    if minimum is None:
         minimum, maximum = 1, 0
-    elif minimum == float("inf"):
-        minimum, maximum = 1, count
     else:
         maximum = max(maximum, minimum + count - 1)
 
-    doc.add_plan(int(minimum), int(maximum), "; ".join(skip_comments), pab)
+    doc.add_plan(minimum, maximum, "; ".join(skip_comments), plan_at_beginning)
 
     return doc
@@ -19,17 +19,21 @@ from .api import TapWriter
 
 import sys
 import typing
+import threading
 
 
 writer: typing.Optional[TapWriter] = None
 counter: int = 0  # counter for tcs, if no plan provided
 planned: bool = False  # was a plan written yet?
+_lock = threading.Lock()  # guards the creation of `writer`
 
 
 def _create() -> None:
     global writer
     if writer is None:
-        writer = TapWriter()
+        with _lock:
+            if writer is None:
+                writer = TapWriter()
 
 
 def plan(
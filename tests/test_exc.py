@@ -5,6 +5,7 @@ from taptaptap3.exc import TapMissingPlan, TapInvalidNumbering
 from taptaptap3.exc import TapBailout, TapParseError
 
 import io
+import yaml
 import pickle
 import unittest
 
@@ -50,6 +51,15 @@ class TestExceptions(unittest.TestCase):
         validate_manually(neg_plan_doc)
         self.assertRaises(TapParseError, parse, negative_plan, True)
 
+    def testMalformedYaml(self):
+        doc = parse("1..1\nok 1\n  ---\n  key: [1, 2\n  ...\n")
+        self.assertEqual(len(doc.entries), 1)
+
+        # YAML blocks are loaded lazily, validation loads them
+        self.assertRaises(yaml.YAMLError, doc.valid)
+        self.assertRaises(yaml.YAMLError, validate_manually, doc)
+        self.assertRaises(yaml.YAMLError, str, doc)
+
     def testBailout(self):
         try:
             raise TapBailout("Message")
@@ -57,6 +67,17 @@ class TestExceptions(unittest.TestCase):
         except TapBailout as e:
             self.assertIn("Bail out!", str(e))
 
+    def testBailoutCopy(self):
+        doc = parse("1..2\nok 1\nBail out! Disk full\n  trace\n")
+        copied = doc.copy()
+        copied.entries[1].data.append("more")
+        self.assertNotIn("more", doc.entries[1].data)
+
+        bailout = TapBailout("Message")
+        bailout.data = ["line"]
+        bailout.copy().data.append("more")
+        self.assertEqual(bailout.data, ["line"])
+
     def testPickle(self):
 
         def trypickle(obj: TapBailout):
@@ -2,8 +2,13 @@
 
 from taptaptap3 import TapDocument, TapTestcase, TapDocumentIterator
 from taptaptap3 import TapDocumentFailedIterator, TapDocumentActualIterator
+from taptaptap3 import TapDocumentValidator, parse_file
+from taptaptap3 import parse_string, harness, TapCreator
+from taptaptap3.api import _validate_with_stats
 from taptaptap3.exc import TapBailout
 
+import os
+import tempfile
 import unittest
 
 
@@ -213,6 +218,12 @@ class TestTapDocument(unittest.TestCase):
         self.assertEqual(doc.count_todo(), 3)
         self.assertEqual(doc.count_skip(), 1)
 
+        # entries modified in place are counted as they are now
+        doc.entries[3].field = False
+        doc.entries[3].skip = True
+        self.assertEqual(doc.count_not_ok(), 3)
+        self.assertEqual(doc.count_skip(), 2)
+
     def testBailout(self):
         doc = TapDocument()
         self.assertFalse(doc.bailed())
@@ -228,6 +239,12 @@ class TestTapDocument(unittest.TestCase):
 
         self.assertEqual(doc.bailout_message(), "FS crash")
 
+        # entries replaced in place are taken into account
+        doc.entries[1] = TapTestcase()
+        doc.entries[2] = TapTestcase()
+        self.assertFalse(doc.bailed())
+        self.assertEqual(doc.actual_length(), 3)
+
     def testValid(self):
         # valid iff
         #   no bailout was thrown AND
@@ -295,6 +312,59 @@ class TestTapDocument(unittest.TestCase):
         doc.add_bailout(TapBailout("System crashed"))
         self.assertFalse(doc.valid())
 
+    def testBulkAdd(self):
+        doc = TapDocument()
+        doc.add_plan(1, 3)
+        self.assertEqual(doc.actual_length(), 0)
+
+        tc = TapTestcase(field=True)
+        doc.bulk_add([tc, TapTestcase(field=False), TapBailout("stop")])
+        self.assertIs(doc.entries[0], tc)
+        self.assertEqual(doc.actual_length(), 2)
+        self.assertEqual(doc.count_not_ok(), 1)
+        self.assertTrue(doc.bailed())
+
+    def testCopy(self):
+        doc = TapDocument()
+        doc.add_plan(1, 2)
+        doc.add_testcase(TapTestcase(field=True, description="first"))
+        doc.add_bailout(TapBailout("disk full"))
+
+        doc2 = doc.copy()
+        self.assertEqual(str(doc2), str(doc))
+        self.assertTrue(doc2.bailed())
+
+        doc2.entries[0].data += ["only in the copy"]
+        self.assertNotIn("only in the copy", str(doc))
+
+    def testValidateWithStats(self):
+        doc = TapDocument()
+        doc.add_testcase(TapTestcase(field=True))
+        doc.add_testcase(TapTestcase(field=False))
+        doc.add_testcase(TapTestcase(field=True))
+        doc.add_testcase(TapTestcase(field=False))
+        doc.add_plan(1, 4)
+        self.assertEqual(_validate_with_stats(doc), (False, (2, 4, 1)))
+
+        doc = TapDocument()
+        doc.add_testcase(TapTestcase(field=True))
+        doc.add_plan(1, 1)
+        self.assertEqual(_validate_with_stats(doc), (True, (0, 1, None)))
+
+
+class TestTapDocumentValidator(unittest.TestCase):
+
+    def testEnumerate(self):
+        enumerate = TapDocumentValidator.enumerate
+        self.assertEqual(enumerate([1, 2, None, 4]), [1, 2, 3, 4])
+        self.assertEqual(enumerate([None, None, 2], lenient=True), [1, 3, 2])
+        self.assertEqual(enumerate([5, None, None], first=3), [5, 3, 4])
+        self.assertRaises(ValueError, enumerate, [None, None, 2])
+        self.assertRaises(ValueError, enumerate, [2, 2], lenient=True)
+
+        # a moved testcase number must not be handed out again
+        self.assertEqual(enumerate([None, 1, None], lenient=True), [2, 1, 3])
+
 
 class TestTapDocumentIterator(unittest.TestCase):
 
@@ -324,6 +394,19 @@ class TestTapDocumentIterator(unittest.TestCase):
 
         self.assertEqual(iterations, 40)
 
+    def testIterRenumbered(self):
+        doc = TapDocument()
+        doc.add_plan(1, 3)
+        for nr, description in enumerate("abc", 1):
+            doc.add_testcase(TapTestcase(True, nr, description))
+        self.assertEqual([tc.description for tc in doc], ["a", "b", "c"])
+
+        # renumbering in place changes the order
+        for tc, nr in zip(doc.entries, (3, 2, 1)):
+            tc.number = nr
+        self.assertEqual([tc.description for tc in doc], ["c", "b", "a"])
+        self.assertEqual(doc[1].description, "c")
+
     def testIter(self):
         description = ["a", "b", "c", "d"]
         doc = TapDocument()
@@ -418,7 +501,29 @@ class TestTapDocumentFailedIterator(unittest.TestCase):
 
 
 class TestTapParsing(unittest.TestCase):
-    pass
+
+    def testHarness(self):
+        doc = parse_string("1..2\nok 1\nnot ok 2 - second\n")
+        self.assertEqual(doc.entries[0].description, "")
+
+        out = harness(doc)
+        self.assertIn("........ok\n", out)
+        self.assertIn("second.................not ok\n", out)
+        self.assertIn("FAILED tests 2\n", out)
+
+    def testParseFile(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filepath = os.path.join(tmpdir, "parsed.tap")
+            with open(filepath, "w") as fp:
+                fp.write("1..1\nok 1 - first\n")
+
+            doc = parse_file(filepath)
+            doc.entries[0].description = "modified"
+            self.assertEqual(parse_file(filepath)[1].description, "first")
+
+            with open(filepath, "w") as fp:
+                fp.write("1..2\nok 1 - first\nnot ok 2 - second\n")
+            self.assertEqual(len(parse_file(filepath)), 2)
 
 
 class TestTapContextManager(unittest.TestCase):
@@ -434,5 +539,23 @@ class TestTapContextManager(unittest.TestCase):
         self.assertIn("failed testcase", str(doc))
 
 
+class TestTapCreator(unittest.TestCase):
+
+    def testExtraKeys(self):
+        result = {"ok": True, "description": "with data", "data": ["a trace"], "severity": "low"}
+
+        @TapCreator
+        def run():
+            yield result
+
+        out = run()
+        self.assertIn("ok - with data", out)
+        self.assertIn("a trace", out)
+        self.assertTrue(out.startswith("1..1"))
+        # the yielded dict is left untouched
+        self.assertEqual(result["data"], ["a trace"])
+        self.assertEqual(len(result), 4)
+
+
 if __name__ == "__main__":
     unittest.main()
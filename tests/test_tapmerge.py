@@ -56,6 +56,17 @@ class MergeTapDocuments(unittest.TestCase):
 
         self.assertEqual(str(merged), str(ref))
 
+    def test_merge_keeps_sources(self):
+        doc1 = parse_file(e("012.tap"))
+        doc2 = parse_file(e("006.tap"))
+        before = (str(doc1), str(doc2))
+
+        merged = taptaptap3.merge(doc1, doc2)
+        merged.entries[-1].data += ["appended to merged document"]
+        merged.entries[-1].todo = "only in merged document"
+
+        self.assertEqual((str(doc1), str(doc2)), before)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,6 +6,7 @@ from taptaptap3 import TapActualNumbering, TapNumbering
 from taptaptap3.exc import TapInvalidNumbering
 
 import io
+import copy
 import pickle
 import unittest
 
@@ -16,9 +17,25 @@ class TestTapYaml(unittest.TestCase):
         d = YamlData([1, 2, 3])
         self.assertEqual(str(d), "---\n- 1\n- 2\n- 3\n...\n")
 
+    def testYamlPlainList(self):
+        d = YamlData(["item 1", -2, "yes", True])
+        self.assertEqual(str(d), "---\n- item 1\n- -2\n- 'yes'\n- true\n...\n")
+
+    def testYamlSource(self):
+        d = YamlData.from_source("- 1\n- 2\n")
+        self.assertEqual(d.data, [1, 2])
+        self.assertEqual(d, YamlData([1, 2]))
+
+        d.data = [3]
+        self.assertEqual(str(d), "---\n- 3\n...\n")
+
 
 class TestTapTestcase(unittest.TestCase):
 
+    def assertAllIn(self, members, container):
+        missing = [m for m in members if m not in container]
+        self.assertFalse(missing, "missing in {!r}".format(container))
+
     def testEmpty(self):
         tc = TapTestcase()
         self.assertIsNone(tc.field)
@@ -34,21 +51,18 @@ class TestTapTestcase(unittest.TestCase):
             tc.field = what
 
         tc = TapTestcase()
-        tc.field = False
-        self.assertFalse(tc.field)
-        tc.field = True
-        self.assertTrue(tc.field)
-        tc.field = "not ok"
-        self.assertFalse(tc.field)
-        tc.field = "ok"
-        self.assertTrue(tc.field)
-        tc.field = "not ok"
-        self.assertFalse(tc.field)
-        tc.field = None
-        self.assertIsNone(tc.field)
+        cases = [
+            (False, False), (True, True), ("not ok", False),
+            ("ok", True), ("not ok", False), (None, None),
+        ]
+        for value, expected in cases:
+            with self.subTest(value=value):
+                tc.field = value
+                self.assertIs(tc.field, expected)
 
         self.assertRaises(ValueError, assign, tc, object())
         self.assertRaises(ValueError, assign, tc, "nonsense")
+        self.assertRaises(ValueError, assign, tc, 1)
 
     def testNumber(self):
 
@@ -101,9 +115,7 @@ class TestTapTestcase(unittest.TestCase):
         self.assertTrue(tc.todo)
 
         tc.directive = "skip abc def TODO bcd efg todo cde fgh"
-        self.assertIn("abc def", tc.directive)
-        self.assertIn("bcd efg", tc.directive)
-        self.assertIn("cde fgh", tc.directive)
+        self.assertAllIn(("abc def", "bcd efg", "cde fgh"), tc.directive)
         self.assertTrue(tc.skip)
         self.assertTrue(tc.todo)
 
@@ -144,6 +156,16 @@ class TestTapTestcase(unittest.TestCase):
         self.assertEqual(tc.description, "desc3")
         self.assertEqual(tc2.description, "desc2")
 
+        tc2.todo = "only in the copy"
+        self.assertFalse(tc.todo)
+        self.assertTrue(tc2.todo)
+
+        tc3 = copy.copy(tc)
+        tc3.skip = "only in the shallow copy"
+        tc3.data = ["only in the shallow copy"]
+        self.assertFalse(tc.skip)
+        self.assertEqual(tc.data, [])
+
     def testImmutability(self):
         # mutables introduce undefined behavior
         data = ["The world", "is not enough"]
@@ -174,12 +196,21 @@ class TestTapTestcase(unittest.TestCase):
         tc = pickle.load(dump_file)
         self.assertFalse(tc.field)
         self.assertEqual(tc.number, 42)
-        self.assertIn("homepage", tc.directive)
-        self.assertIn("that", tc.directive)
+        self.assertAllIn(("homepage", "that"), tc.directive)
         self.assertTrue(tc.todo and tc.skip)
         self.assertEqual(tc.description, "description")
         self.assertTrue(len(tc.data) == 4 and tc.data[1] == "life")
 
+    def testPickleYaml(self):
+        tc = TapTestcase(True, 1, "with data")
+        tc.data = [YamlData.from_source("a: 1\nb: [2, 3]\n")]
+
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            with self.subTest(protocol=protocol):
+                restored = pickle.loads(pickle.dumps(tc, protocol))
+                self.assertEqual(restored.data[0].data, {"a": 1, "b": [2, 3]})
+                self.assertEqual(str(restored), str(tc))
+
     def testStringRepr(self):
         tc = TapTestcase()
         tc.field = False
@@ -189,12 +220,10 @@ class TestTapTestcase(unittest.TestCase):
         tc.data = ["The answer to", "life", "universe", "everything"]
 
         text = str(tc)
-        self.assertIn("not ok", text)
-        self.assertIn("42", text)
-        self.assertIn("007", text)
-        self.assertIn("james bond", text)
-        self.assertIn("The world is not enough", text)
-        self.assertIn("universe", text)
+        self.assertAllIn(
+            ("not ok", "42", "007", "james bond", "The world is not enough", "universe"),
+            text,
+        )
 
     def testExactStringRepr(self):
         tc = TapTestcase()
@@ -211,6 +240,25 @@ class TestTapTestcase(unittest.TestCase):
             str(tc),
         )
 
+    def testStringReprAfterModification(self):
+        tc = TapTestcase(True, 1, "first")
+        self.assertEqual("ok 1 - first\n", str(tc))
+
+        tc.description = "second"
+        tc.todo = "later"
+        self.assertEqual("ok 1 - second  # TODO later\n", str(tc))
+
+        tc.field = False
+        tc.number = 2
+        tc.data.append("trace\n")
+        self.assertEqual("not ok 2 - second  # TODO later\ntrace\n", str(tc))
+
+        tc = TapTestcase(True, 1, "a")
+        data = tc.data
+        self.assertEqual("ok 1 - a\n", str(tc))
+        data.append("trace")
+        self.assertEqual("ok 1 - a\ntrace\n", str(tc))
+
 
 class TestTapNumbering(unittest.TestCase):
 
@@ -264,7 +312,8 @@ class TestTapNumbering(unittest.TestCase):
 
     def testEnumeration(self):
         num = TapNumbering(tests=5)
-        self.assertEqual(num.enumeration(), [1, 2, 3, 4, 5])
+        self.assertEqual(num.enumeration(), range(1, 6))
+        self.assertEqual(list(num.enumeration()), [1, 2, 3, 4, 5])
 
     def testInc(self):
         num = TapNumbering(tests=5)
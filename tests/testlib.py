@@ -3,9 +3,9 @@
 
 import re
 import sys
-import codecs
 import subprocess
 import taptaptap3
+import concurrent.futures
 
 success = lambda x: print("  [ OK ]  " + x)
 
@@ -25,8 +25,9 @@ def call_module(filepath):
     return valid, ok, total, bailout, err, out
 
 
-def call_tapvalidate(args):
-    """Call tapvalidate with args and return the metrics tuple"""
+def call_tapvalidate(args, content):
+    """Call tapvalidate with args and return the metrics tuple.
+    `content` is the text of the TAP file given as first argument."""
     cmd = ["tapvalidate"] + args
 
     proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
@@ -46,8 +47,7 @@ def call_tapvalidate(args):
     #   BUT python3 setup.py develop
     # this works for me(tm)
 
-    with codecs.open(args[0], encoding="utf-8") as fp:
-        err = fp.read()
+    err = content
     out = ""
 
     valid = proc.returncode
@@ -64,12 +64,13 @@ def run_python_file(filepath):
     proc = subprocess.Popen(
         ["python", filepath], stdout=subprocess.PIPE, stderr=subprocess.PIPE
     )
-    proc.wait()
+    # communicate() waits for the process, a preceding wait() could
+    # deadlock once the output exceeds the pipe buffer
     out, err = proc.communicate()
     out, err = out.decode(encoding), err.decode(encoding)
     print(out, err)
 
-    with codecs.open(filepath, encoding="utf-8") as fp:
+    with open(filepath, encoding="utf-8") as fp:
         source = fp.read()
 
     if "## " in source:
@@ -97,12 +98,10 @@ def run_python_file(filepath):
         success("Exit code is fine")
 
 
-def run_tap_file(filepath):
-    """Interpret a TAP file and test its conditions"""
+def run_tap_file(filepath, content):
+    """Interpret a TAP file with text `content` and test its conditions"""
     doc = taptaptap3.parse_file(filepath)
-
-    with codecs.open(filepath, encoding="utf-8") as fp:
-        err = fp.read()
+    err = content
 
     if doc.bailed():
         valid = -2
@@ -114,78 +113,111 @@ def run_tap_file(filepath):
     return (valid, doc.count_ok(), len(doc), doc.bailed(), "", err)
 
 
-validity = re.compile(r"##     validity: (-?\d+)", flags=re.I)
-tests = re.compile(r"## ok testcases: (\d+) / (\d+)", flags=re.I)
-rbailout = re.compile(r"##      bailout: (no|yes)", flags=re.I)
-inout = re.compile(r"##       stdout: (~?)(\S*)", flags=re.I)
-inerr = re.compile(r"##       stderr: (~?)(\S*)", flags=re.I)
+validity = re.compile(r"##     validity: (-?\d+)", flags=re.I | re.A)
+tests = re.compile(r"## ok testcases: (\d+) / (\d+)", flags=re.I | re.A)
+rbailout = re.compile(r"##      bailout: (no|yes)", flags=re.I | re.A)
+inout = re.compile(r"##       stdout: (~?)(\S*)", flags=re.I | re.A)
+inerr = re.compile(r"##       stderr: (~?)(\S*)", flags=re.I | re.A)
+
+
+def _check_validity(match, valid, ok, total, bailout, stdout, stderr):
+    (expect_ec,) = match.groups()
+    expect_ec = int(expect_ec)
+    expect_ec, valid = expect_ec % 256, valid % 256
+    msg = "Expected validity {}, but was {}"
+    assert expect_ec == valid, msg.format(expect_ec, valid)
+    success("Validity state is fine")
+
+
+def _check_tests(match, valid, ok, total, bailout, stdout, stderr):
+    expect_ok, expect_total = map(int, match.groups())
+
+    msg = "Expected {} of {} to be 'ok' testcases. But got {}/{}"
+    assert (expect_ok, expect_total) == (ok, total), msg.format(
+        expect_ok, expect_total, ok, total
+    )
+    success("Ratio of ok / not-ok testcases is fine")
+
+
+def _check_bailout(match, valid, ok, total, bailout, stdout, stderr):
+    (answer,) = match.groups()
+    expect_bailout = answer == "yes"
+    if expect_bailout and not bailout:
+        raise AssertionError("Expected Bailout was not thrown")
+    elif expect_bailout:
+        success("Bailout was thrown as expected")
+    else:
+        success("No bailout was thrown as expected")
+
+
+def _check_stdout(match, valid, ok, total, bailout, stdout, stderr):
+    negated, substr = match.groups()
+    if negated:
+        msg = "String '{}' must not be in stdout:\n{}"
+        assert substr not in stdout, msg.format(substr, repr(stdout))
+    else:
+        msg = "Expected string '{}' missing in stdout:\n{}"
+        assert substr in stdout, msg.format(substr, repr(stdout))
+
+
+def _check_stderr(match, valid, ok, total, bailout, stdout, stderr):
+    negated, substr = match.groups()
+    if negated:
+        msg = "String '{}' must not be in stderr:\n{}"
+        assert substr not in stdout, msg.format(substr, repr(stderr))
+    else:
+        msg = "Expected string '{}' missing in stderr:\n{}"
+        assert substr in stderr, msg.format(substr, repr(stderr))
+
+
+# condition regexes in order of precedence and their checks
+CHECKS = (
+    (validity, _check_validity),
+    (tests, _check_tests),
+    (rbailout, _check_bailout),
+    (inout, _check_stdout),
+    (inerr, _check_stderr),
+)
 
 
 def check_line(line, valid, ok, total, bailout, stdout, stderr):
-    matches = [validity, tests, rbailout, inout, inerr]
-    matches = [r.match(line) for r in matches]
-
-    if matches[0]:
-        expect_ec = int(matches[0].group(1))
-        expect_ec, valid = expect_ec % 256, valid % 256
-        msg = "Expected validity {}, but was {}"
-        assert expect_ec == valid, msg.format(expect_ec, valid)
-        success("Validity state is fine")
-
-    elif matches[1]:
-        expect_ok = int(matches[1].group(1))
-        expect_total = int(matches[1].group(2))
-
-        msg = "Expected {} of {} to be 'ok' testcases. But got {}/{}"
-        assert (expect_ok, expect_total) == (ok, total), msg.format(
-            expect_ok, expect_total, ok, total
-        )
-        success("Ratio of ok / not-ok testcases is fine")
-
-    elif matches[2]:
-        expect_bailout = matches[2].group(1) == "yes"
-        if expect_bailout and not bailout:
-            raise AssertionError("Expected Bailout was not thrown")
-        elif expect_bailout:
-            success("Bailout was thrown as expected")
-        else:
-            success("No bailout was thrown as expected")
+    # all conditions are annotated in lines starting with "##"
+    if not line.startswith("##"):
+        return
 
-    elif matches[3]:
-        substr = matches[3].group(2)
-        if matches[3].group(1):
-            msg = "String '{}' must not be in stdout:\n{}"
-            assert substr not in stdout, msg.format(substr, repr(stdout))
-        else:
-            msg = "Expected string '{}' missing in stdout:\n{}"
-            assert substr in stdout, msg.format(substr, repr(stdout))
-
-    elif matches[4]:
-        substr = matches[4].group(2)
-        if matches[4].group(1):
-            msg = "String '{}' must not be in stderr:\n{}"
-            assert substr not in stdout, msg.format(substr, repr(stderr))
-        else:
-            msg = "Expected string '{}' missing in stderr:\n{}"
-            assert substr in stderr, msg.format(substr, repr(stderr))
+    for regex, check in CHECKS:
+        match = regex.match(line)
+        if match:
+            check(match, valid, ok, total, bailout, stdout, stderr)
+            break
 
 
-def read_file(filepath, valid, ok, total, bailout, stdout, stderr):
-    with codecs.open(filepath, encoding="utf-8") as fp:
-        for line in fp.readlines():
-            check_line(line, valid, ok, total, bailout, stdout, stderr)
+def check_lines(lines, valid, ok, total, bailout, stdout, stderr):
+    for line in lines:
+        check_line(line, valid, ok, total, bailout, stdout, stderr)
 
 
 def validate(filepath):
     if filepath.endswith(".py"):
         run_python_file(filepath)
     else:
-        print()
-        read_file(filepath, *run_tap_file(filepath))
-        print()
-        read_file(filepath, *call_tapvalidate([filepath]))
-        print()
-        read_file(filepath, *call_module(filepath))
+        # read once, all checks share the content
+        with open(filepath, encoding="utf-8") as fp:
+            content = fp.read()
+        lines = content.splitlines()
+
+        # only the subprocess calls run concurrently; the in-process parser
+        # logs through the shared root logger and stays in this thread
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+            results = [
+                pool.submit(call_tapvalidate, [filepath], content),
+                pool.submit(call_module, filepath),
+            ]
+            print()
+            check_lines(lines, *run_tap_file(filepath, content))
+            for result in results:
+                print()
+                check_lines(lines, *result.result())
 
     print()
     return 0